@@ -1,4 +1,5 @@
 from utils.file_handler import read_and_clean_sales_data
+from utils.rejection_sink import RejectionSink
 from utils.data_processor import (
     validate_and_filter,
     calculate_total_revenue,
@@ -9,49 +10,54 @@ from utils.data_processor import (
     find_peak_sales_day,
     low_performing_products
 )
+from utils.customer_analytics import analyze_customers
+from utils.time_series import rolling_sales_metrics, top_peak_days
 from utils.api_handler import (
     fetch_all_products,
     create_product_mapping,
-    enrich_sales_data,
-    save_enriched_data
+    enrich_sales_data_parallel
 )
 import datetime
+from itertools import islice
 
 def main():
     try:
         print("SALES ANALYTICS SYSTEM\n")
 
-        # Step 1: Read and clean sales data
-        print("[1/10] Reading sales data...")
-        filename = "data/sales_data.txt"
-        cleaned_data = read_and_clean_sales_data(filename)
-        print(f"Successfully read {len(cleaned_data)} transactions.\n")
+        # Steps 1-3 record dropped rows; the sink is closed even if a step fails
+        with RejectionSink(filename="output/rejected_rows.txt") as rejections:
+            # Step 1: Read and clean sales data
+            print("[1/10] Reading sales data...")
+            filename = "data/sales_data.txt"
+            cleaned_data = read_and_clean_sales_data(filename, rejections=rejections)
+            print(f"Successfully read {len(cleaned_data)} transactions.\n")
 
-        if not cleaned_data:
-            print("No valid data to process.")
-            return
+            if not cleaned_data:
+                print("No valid data to process.")
+                return
 
-        # Step 2: Convert cleaned data (list of lists) to dictionaries
-        print("[2/10] Converting cleaned data to transaction dictionaries...")
-        transactions = []
-        for parts in cleaned_data:
-            transaction = {
-                'TransactionID': parts[0],
-                'Date': parts[1],
-                'ProductID': parts[2],
-                'ProductName': parts[3],
-                'Quantity': parts[4],
-                'UnitPrice': parts[5],
-                'CustomerID': parts[6],
-                'Region': parts[7]
-            }
-            transactions.append(transaction)
-        print(f"Successfully converted {len(transactions)} transactions.\n")
+            # Step 2: Convert cleaned data (list of lists) to dictionaries
+            print("[2/10] Converting cleaned data to transaction dictionaries...")
+            transactions = []
+            for parts in cleaned_data:
+                transaction = {
+                    'TransactionID': parts[0],
+                    'Date': parts[1],
+                    'ProductID': parts[2],
+                    'ProductName': parts[3],
+                    'Quantity': parts[4],
+                    'UnitPrice': parts[5],
+                    'CustomerID': parts[6],
+                    'Region': parts[7]
+                }
+                transactions.append(transaction)
+            print(f"Successfully converted {len(transactions)} transactions.\n")
 
-        # Step 3: Validate and filter transactions
-        print("[3/10] Validating transactions...")
-        valid_transactions, invalid_count, summary = validate_and_filter(transactions)
-        print(f"Valid: {len(valid_transactions)} | Invalid: {invalid_count}\n")
+            # Step 3: Validate and filter transactions
+            print("[3/10] Validating transactions...")
+            valid_transactions, invalid_count, summary = validate_and_filter(transactions, rejections=rejections)
+            print(f"Valid: {len(valid_transactions)} | Invalid: {invalid_count}")
+            print(f"Rejections by reason: {rejections.summary()}\n")
 
         # Step 4: Analyze sales data
         print("[4/10] Analyzing sales data...\n")
@@ -60,8 +66,11 @@ def main():
         top_products = top_selling_products(valid_transactions, n=5)
         customer_stats = customer_analysis(valid_transactions)
         daily_trends = daily_sales_trend(valid_transactions)
-        peak_day = find_peak_sales_day(valid_transactions)
+        peak_day = find_peak_sales_day(valid_transactions, daily_trends=daily_trends)
+        rolling_metrics = rolling_sales_metrics(daily_trends, windows=(7, 30))
+        peak_days = top_peak_days(daily_trends, k=3)
         low_products = low_performing_products(valid_transactions)
+        customer_analytics = analyze_customers(valid_transactions)
 
         print(f"Total Revenue: {total_revenue}")
         print(f"Region-wise Sales: {region_stats}\n")
@@ -71,10 +80,20 @@ def main():
         print("\nCustomer Analysis (Top 3):")
         for cid, stats in list(customer_stats.items())[:3]:
             print(cid, stats)
+        print("\nRFM Scores (first 3):")
+        for cid, scores in islice(customer_analytics.iter_rfm(), 3):
+            print(cid, scores)
+        print("Cohorts:", customer_analytics.cohorts())
+        print("Cohort Retention (%):", customer_analytics.cohort_retention())
         print("\nDaily Sales Trend (first 3 days):")
         for date, info in list(daily_trends.items())[:3]:
             print(date, info)
         print("\nPeak Sales Day:", peak_day)
+        print("Top 3 Peak Days:", peak_days)
+        if rolling_metrics:
+            latest = list(rolling_metrics.values())[-1]
+            print(f"Rolling Revenue as of {latest['date']}: {latest['rolling_revenue']}")
+            print(f"Week-over-Week: {latest['week_over_week']}")
         print("\nLow Performing Products:")
         for prod in low_products:
             print(prod)
@@ -89,15 +108,23 @@ def main():
 
         # Step 6: Enrich sales data
         print("[6/10] Enriching sales data...")
-        enriched_transactions = enrich_sales_data(valid_transactions, product_mapping)
-        save_enriched_data(enriched_transactions)
+        enriched_transactions = enrich_sales_data_parallel(
+            valid_transactions, product_mapping, filename="data/enriched_sales_data.txt"
+        )
         print("Enriched sales data saved successfully.\n")
 
         # Step 7: Generate final report
         print("[7/10] Generating comprehensive sales report...")
-        from utils.report_generator import generate_sales_report
-        generate_sales_report(valid_transactions, enriched_transactions)
-        print("Sales report generated and saved to output/sales_report.txt\n")
+        from utils.report_generator import build_report_aggregates, write_reports
+        # Reuse the step 4 results instead of aggregating the transactions again
+        report_stats = build_report_aggregates(
+            total_revenue, region_stats, top_products, customer_stats,
+            daily_trends, low_products, enriched_transactions
+        )
+        for path in write_reports(report_stats, "output/sales_report.txt",
+                                  formats=("txt", "json", "csv", "html")):
+            print(f"Sales report generated and saved to {path}")
+        print()
 
         print("[10/10] ALL TASKS COMPLETED SUCCESSFULLY ✅")
 
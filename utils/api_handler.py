@@ -1,3 +1,8 @@
+import multiprocessing
+import os
+from array import array
+from bisect import bisect_left
+
 import requests
 
 # --------------------------
@@ -72,20 +77,180 @@ def enrich_sales_data(transactions, product_mapping):
     print(f"Enriched {len(enriched)}/{len(transactions)} transactions.")
     return enriched
 
+ENRICHED_HEADERS = [
+    "TransactionID","Date","ProductID","ProductName","Quantity","UnitPrice",
+    "CustomerID","Region","API_Category","API_Brand","API_Rating","API_Match"
+]
+
+def _format_enriched_row(t):
+    return "|".join(str(t.get(h, "")) for h in ENRICHED_HEADERS) + "\n"
+
 def save_enriched_data(enriched_transactions, filename="data/enriched_sales_data.txt"):
     """
     Saves enriched transactions back to a file (pipe-delimited).
     """
-    headers = [
-        "TransactionID","Date","ProductID","ProductName","Quantity","UnitPrice",
-        "CustomerID","Region","API_Category","API_Brand","API_Rating","API_Match"
-    ]
     try:
         with open(filename, "w", encoding="utf-8") as f:
-            f.write("|".join(headers) + "\n")
+            f.write("|".join(ENRICHED_HEADERS) + "\n")
             for t in enriched_transactions:
-                row = [str(t.get(h, "")) for h in headers]
-                f.write("|".join(row) + "\n")
+                f.write(_format_enriched_row(t))
         print(f"Enriched sales data saved to {filename}")
     except Exception as e:
         print(f"Error saving enriched data: {e}")
+
+# --------------------------
+# Task 3.3: Parallel Enrichment
+# --------------------------
+class CompactCatalog:
+    """
+    Array-backed, read-only copy of the product mapping.
+    IDs are kept sorted in an array('q') and looked up with bisect;
+    category, brand and rating values are stored once, exactly as the API
+    returned them, and referenced by index.
+    """
+
+    def __init__(self, product_mapping):
+        ids = sorted(product_mapping)
+        self.ids = array('q', ids)
+        self.category_codes = array('l')
+        self.brand_codes = array('l')
+        self.rating_codes = array('l')
+        self.values = []
+        codes = {}
+
+        def encode(value):
+            if value is None:
+                return -1
+            # Keyed by type too, so 4 and 4.0 keep their own representation
+            try:
+                key = (type(value), value)
+                if key not in codes:
+                    codes[key] = len(self.values)
+                    self.values.append(value)
+                return codes[key]
+            except TypeError:
+                self.values.append(value)
+                return len(self.values) - 1
+
+        for numeric_id in ids:
+            info = product_mapping[numeric_id]
+            self.category_codes.append(encode(info.get('category')))
+            self.brand_codes.append(encode(info.get('brand')))
+            self.rating_codes.append(encode(info.get('rating')))
+
+    def lookup(self, numeric_id):
+        """
+        Returns: tuple (category, brand, rating) or None if the ID is unknown
+        """
+        i = bisect_left(self.ids, numeric_id)
+        if i == len(self.ids) or self.ids[i] != numeric_id:
+            return None
+        return tuple(
+            self.values[code] if code >= 0 else None
+            for code in (self.category_codes[i], self.brand_codes[i], self.rating_codes[i])
+        )
+
+# Set before the worker pool starts; forked workers inherit it without pickling
+_SHARED_CATALOG = None
+
+def _init_worker(catalog):
+    global _SHARED_CATALOG
+    _SHARED_CATALOG = catalog
+
+def _enrich_chunk(chunk):
+    enriched = []
+    for t in chunk:
+        enriched_t = t.copy()
+        try:
+            numeric_id = int(''.join(filter(str.isdigit, t['ProductID'])))
+            api_info = _SHARED_CATALOG.lookup(numeric_id)
+        except Exception:
+            api_info = None
+        if api_info:
+            enriched_t['API_Category'], enriched_t['API_Brand'], enriched_t['API_Rating'] = api_info
+            enriched_t['API_Match'] = True
+        else:
+            enriched_t['API_Category'] = None
+            enriched_t['API_Brand'] = None
+            enriched_t['API_Rating'] = None
+            enriched_t['API_Match'] = False
+        enriched.append(enriched_t)
+    return enriched
+
+def enrich_sales_data_parallel(transactions, product_mapping, workers=None,
+                               chunk_size=5000, filename=None):
+    """
+    Enrich transactions in chunks across worker processes.
+    Produces the same fields as enrich_sales_data. The catalog is shared
+    through fork inheritance (or sent once per worker where fork is unavailable).
+    If filename is given, chunks are written in input order as they complete,
+    in the same format as save_enriched_data; write errors are printed and
+    enrichment continues, as in save_enriched_data.
+    Returns the enriched transactions in input order.
+    """
+    global _SHARED_CATALOG
+    catalog = CompactCatalog(product_mapping)
+    chunks = [transactions[i:i + chunk_size] for i in range(0, len(transactions), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    out = None
+    if filename:
+        try:
+            out = open(filename, "w", encoding="utf-8")
+            out.write("|".join(ENRICHED_HEADERS) + "\n")
+        except Exception as e:
+            print(f"Error saving enriched data: {e}")
+            out = _close_quietly(out)
+
+    enriched = []
+    try:
+        if workers == 1 or len(chunks) <= 1:
+            _SHARED_CATALOG = catalog
+            results = map(_enrich_chunk, chunks)
+            pool = None
+        elif "fork" in multiprocessing.get_all_start_methods():
+            _SHARED_CATALOG = catalog
+            pool = multiprocessing.get_context("fork").Pool(workers)
+            results = pool.imap(_enrich_chunk, chunks)
+        else:
+            pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(catalog,))
+            results = pool.imap(_enrich_chunk, chunks)
+
+        try:
+            for chunk in results:
+                if out:
+                    try:
+                        out.writelines(_format_enriched_row(t) for t in chunk)
+                    except Exception as e:
+                        print(f"Error saving enriched data: {e}")
+                        out = _close_quietly(out)
+                enriched.extend(chunk)
+        except Exception:
+            if pool:
+                pool.terminate()
+            raise
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+    finally:
+        _SHARED_CATALOG = None
+        if out:
+            try:
+                out.close()
+            except Exception as e:
+                print(f"Error saving enriched data: {e}")
+                out = None
+
+    print(f"Enriched {len(enriched)}/{len(transactions)} transactions using {len(chunks)} chunks.")
+    if out:
+        print(f"Enriched sales data saved to {filename}")
+    return enriched
+
+def _close_quietly(f):
+    if f:
+        try:
+            f.close()
+        except Exception:
+            pass
+    return None
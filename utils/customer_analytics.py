@@ -0,0 +1,189 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+
+class CustomerAnalytics:
+    """
+    Compact per-customer state for RFM scoring and monthly cohorts.
+    Customer IDs are interned to integer codes; every per-customer metric
+    lives in a fixed-width array indexed by that code, and the months a
+    customer was active are a bitmask relative to their first-purchase month.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self.customer_ids = []
+        self.first_day = array('l')
+        self.last_day = array('l')
+        self.first_month = array('l')
+        self.frequency = array('l')
+        self.monetary = array('d')
+        self.active_months = []
+
+    def __len__(self):
+        return len(self.customer_ids)
+
+    def add(self, transaction):
+        """
+        Adds one validated transaction dictionary
+        """
+        cust_id = transaction['CustomerID']
+        purchase_date = date.fromisoformat(transaction['Date'])
+        day = purchase_date.toordinal()
+        month = purchase_date.year * 12 + purchase_date.month - 1
+        amount = transaction['Quantity'] * transaction['UnitPrice']
+
+        code = self._codes.get(cust_id)
+        if code is None:
+            code = len(self.customer_ids)
+            self._codes[cust_id] = code
+            self.customer_ids.append(cust_id)
+            self.first_day.append(day)
+            self.last_day.append(day)
+            self.first_month.append(month)
+            self.frequency.append(1)
+            self.monetary.append(amount)
+            self.active_months.append(1)
+            return
+
+        if day < self.first_day[code]:
+            self.first_day[code] = day
+        if day > self.last_day[code]:
+            self.last_day[code] = day
+        if month < self.first_month[code]:
+            # Earlier purchase arrived late: re-base the activity mask
+            self.active_months[code] <<= self.first_month[code] - month
+            self.first_month[code] = month
+        self.active_months[code] |= 1 << (month - self.first_month[code])
+        self.frequency[code] += 1
+        self.monetary[code] += amount
+
+    def rfm_scores(self, reference_date=None, bins=5):
+        """
+        Scores recency, frequency and monetary value from 1 (worst) to `bins` (best)
+        by percentile rank; ties share a score. Recency is counted in days
+        before reference_date (defaults to the latest purchase date).
+        Returns: tuple of arrays (R, F, M) indexed like customer_ids
+        """
+        if bins < 1:
+            raise ValueError("bins must be a positive integer")
+        if not self.customer_ids:
+            return array('l'), array('l'), array('l')
+
+        reference = self._reference_day(reference_date)
+        recency = array('l', (reference - d for d in self.last_day))
+        return (
+            _percentile_scores(recency, bins, higher_is_better=False),
+            _percentile_scores(self.frequency, bins),
+            _percentile_scores(self.monetary, bins)
+        )
+
+    def iter_rfm(self, reference_date=None, bins=5):
+        """
+        Yields (CustomerID, {recency, frequency, monetary, R, F, M, RFM}) one
+        customer at a time, in customer_ids order, without building them all
+        (RFM joins the three scores with '-' when bins >= 10)
+        """
+        r_scores, f_scores, m_scores = self.rfm_scores(reference_date, bins)
+        if not self.customer_ids:
+            return
+        reference = self._reference_day(reference_date)
+        for code, cust_id in enumerate(self.customer_ids):
+            r, f, m = r_scores[code], f_scores[code], m_scores[code]
+            yield cust_id, {
+                'recency': reference - self.last_day[code],
+                'frequency': self.frequency[code],
+                'monetary': round(self.monetary[code], 2),
+                'R': r,
+                'F': f,
+                'M': m,
+                'RFM': f"{r}{f}{m}" if bins < 10 else f"{r}-{f}-{m}"
+            }
+
+    def rfm_table(self, reference_date=None, bins=5):
+        """
+        Returns: dictionary {CustomerID: {recency, frequency, monetary, R, F, M, RFM}}
+        Builds a dictionary per customer, so only use it on small inputs
+        """
+        return dict(self.iter_rfm(reference_date, bins))
+
+    def _reference_day(self, reference_date):
+        if reference_date is None:
+            return max(self.last_day)
+        if isinstance(reference_date, date):
+            return reference_date.toordinal()
+        return date.fromisoformat(reference_date).toordinal()
+
+    def cohorts(self):
+        """
+        Groups customers by the month of their first purchase
+        Returns: dictionary sorted by month {'YYYY-MM': customer_count}
+        """
+        counts = {}
+        for month in self.first_month:
+            counts[month] = counts.get(month, 0) + 1
+        return {_month_label(m): counts[m] for m in sorted(counts)}
+
+    def cohort_retention(self):
+        """
+        Share of each first-purchase cohort that bought again N months later
+        Returns: dictionary sorted by cohort {'YYYY-MM': [pct_month_0, pct_month_1, ...]}
+        """
+        sizes = {}
+        active = {}
+        for month, mask in zip(self.first_month, self.active_months):
+            sizes[month] = sizes.get(month, 0) + 1
+            counts = active.setdefault(month, [])
+            offset = 0
+            while mask:
+                if mask & 1:
+                    if offset >= len(counts):
+                        counts.extend([0] * (offset + 1 - len(counts)))
+                    counts[offset] += 1
+                mask >>= 1
+                offset += 1
+
+        retention = {}
+        for month in sorted(sizes):
+            size = sizes[month]
+            retention[_month_label(month)] = [round(c / size * 100, 2) for c in active[month]]
+        return retention
+
+
+def _percentile_scores(values, bins, higher_is_better=True):
+    """
+    Scores each value 1..bins by the share of values it is at least as good as,
+    so ties share a score and the best value always scores `bins`.
+
+    >>> list(_percentile_scores([1, 2, 2], 5))
+    [2, 5, 5]
+    >>> list(_percentile_scores([0, 3, 3], 5, higher_is_better=False))
+    [5, 4, 4]
+    >>> list(_percentile_scores([7], 5))
+    [5]
+    """
+    ordered = sorted(values)
+    n = len(ordered)
+    scores = array('l')
+    for v in values:
+        if higher_is_better:
+            at_least_as_good = bisect_right(ordered, v)
+        else:
+            at_least_as_good = n - bisect_left(ordered, v)
+        scores.append(-(-at_least_as_good * bins // n))
+    return scores
+
+
+def _month_label(month):
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def analyze_customers(transactions):
+    """
+    Builds CustomerAnalytics state from validated transactions
+    """
+    analytics = CustomerAnalytics()
+    for t in transactions:
+        analytics.add(t)
+    return analytics
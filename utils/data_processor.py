@@ -1,3 +1,7 @@
+import datetime
+
+from utils import rejection_sink as reasons
+
 def analyze_sales(data):
     total_revenue = sum(row[4]*row[5] for row in data)
     region_sales = {}
@@ -51,9 +55,10 @@ def parse_transactions(raw_lines):
     return transactions
 
 
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, rejections=None):
     """
     Validates transactions and applies optional filters
+    If a RejectionSink is passed as rejections, each invalid transaction is recorded with its reason
     Returns: tuple(valid_transactions, invalid_count, filter_summary)
     """
     valid_transactions = []
@@ -68,11 +73,14 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
             t.get('Quantity', 0) > 0 and
             t.get('UnitPrice', 0) > 0 and
             all(field in t for field in ['TransactionID', 'Date', 'ProductID', 'ProductName',
-                                         'Quantity', 'UnitPrice', 'CustomerID', 'Region'])
+                                         'Quantity', 'UnitPrice', 'CustomerID', 'Region']) and
+            _is_iso_date(t['Date'])
         ):
             valid_transactions.append(t)
         else:
             invalid_count += 1
+            if rejections is not None:
+                rejections.record(_rejection_reason(t), t, t.get('TransactionID'), reasons.STAGE_VALIDATE)
 
     total_input = len(transactions)
 
@@ -117,6 +125,29 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
 
     return filtered_transactions, invalid_count, summary
 
+def _rejection_reason(t):
+    required = ['TransactionID', 'Date', 'ProductID', 'ProductName',
+                'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+    if not all(field in t for field in required):
+        return reasons.MISSING_FIELD
+    if not (t['TransactionID'].startswith('T') and
+            t['ProductID'].startswith('P') and
+            t['CustomerID'].startswith('C')):
+        return reasons.BAD_PREFIX
+    if t['Quantity'] <= 0 or t['UnitPrice'] <= 0:
+        return reasons.NON_POSITIVE_AMOUNT
+    return reasons.INVALID_DATE
+
+
+def _is_iso_date(value):
+    # Rolling and customer analytics parse dates, so reject bad ones here;
+    # only canonical YYYY-MM-DD, since fromisoformat also takes 20241201 or 2024-W49-1
+    try:
+        return datetime.date.fromisoformat(value).isoformat() == value
+    except (TypeError, ValueError):
+        return False
+
+
 # Task 2.1: Total Revenue
 def calculate_total_revenue(transactions):
     total = 0.0
@@ -255,26 +286,30 @@ def daily_sales_trend(transactions):
     return daily_stats
 
 
-def find_peak_sales_day(transactions):
+def find_peak_sales_day(transactions, daily_trends=None):
     """
     Identifies the date with highest revenue
+    Pass the output of daily_sales_trend as daily_trends to skip re-aggregating
     Returns: tuple (date, revenue, transaction_count)
     """
 
-    daily_data = {}
+    if daily_trends is not None:
+        daily_data = daily_trends
+    else:
+        daily_data = {}
 
-    for t in transactions:
-        date = t['Date']
-        revenue = t['Quantity'] * t['UnitPrice']
+        for t in transactions:
+            date = t['Date']
+            revenue = t['Quantity'] * t['UnitPrice']
 
-        if date not in daily_data:
-            daily_data[date] = {
-                'revenue': 0.0,
-                'transaction_count': 0
-            }
+            if date not in daily_data:
+                daily_data[date] = {
+                    'revenue': 0.0,
+                    'transaction_count': 0
+                }
 
-        daily_data[date]['revenue'] += revenue
-        daily_data[date]['transaction_count'] += 1
+            daily_data[date]['revenue'] += revenue
+            daily_data[date]['transaction_count'] += 1
 
     peak_date = None
     max_revenue = 0.0
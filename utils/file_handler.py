@@ -1,4 +1,7 @@
-def read_and_clean_sales_data(file_path):
+from utils import rejection_sink as reasons
+
+
+def read_and_clean_sales_data(file_path, rejections=None):
     cleaned_data = []
     invalid_count = 0
     total_count = 0
@@ -8,10 +11,14 @@ def read_and_clean_sales_data(file_path):
             line = line.strip()
             if not line:
                 invalid_count += 1
+                if rejections is not None:
+                    rejections.record(reasons.EMPTY_LINE, line, total_count, reasons.STAGE_READ)
                 continue
             parts = line.split("|")
             if len(parts) != 8:
                 invalid_count += 1
+                if rejections is not None:
+                    rejections.record(reasons.WRONG_FIELD_COUNT, line, total_count, reasons.STAGE_READ)
                 continue
             trans_id, date, prod_id, prod_name, qty, price, cust_id, region = parts
             try:
@@ -19,9 +26,27 @@ def read_and_clean_sales_data(file_path):
                 price = float(price.replace(",", ""))
             except:
                 invalid_count += 1
+                if rejections is not None:
+                    if total_count == 1 and trans_id.lstrip("\ufeff").strip() == "TransactionID":
+                        reason = reasons.HEADER
+                    elif isinstance(qty, int):
+                        reason = reasons.NON_NUMERIC_PRICE
+                    else:
+                        reason = reasons.NON_NUMERIC_QUANTITY
+                    rejections.record(reason, line, total_count, reasons.STAGE_READ)
                 continue
             if not cust_id or not region or not trans_id.startswith("T") or qty <= 0 or price <= 0:
                 invalid_count += 1
+                if rejections is not None:
+                    if not region:
+                        reason = reasons.EMPTY_REGION
+                    elif not cust_id:
+                        reason = reasons.EMPTY_CUSTOMER
+                    elif not trans_id.startswith("T"):
+                        reason = reasons.BAD_PREFIX
+                    else:
+                        reason = reasons.NON_POSITIVE_AMOUNT
+                    rejections.record(reason, line, total_count, reasons.STAGE_READ)
                 continue
             prod_name = prod_name.replace(",", "")
             cleaned_data.append([trans_id, date, prod_id, prod_name, qty, price, cust_id, region])
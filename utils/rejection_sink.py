@@ -0,0 +1,103 @@
+import os
+from collections import Counter, deque
+
+# Reason codes; HEADER marks the input file's column header line, not a data error
+HEADER = "header"
+EMPTY_LINE = "empty_line"
+WRONG_FIELD_COUNT = "wrong_field_count"
+NON_NUMERIC_QUANTITY = "non_numeric_quantity"
+NON_NUMERIC_PRICE = "non_numeric_price"
+BAD_PREFIX = "bad_prefix"
+NON_POSITIVE_AMOUNT = "non_positive_amount"
+EMPTY_REGION = "empty_region"
+EMPTY_CUSTOMER = "empty_customer"
+MISSING_FIELD = "missing_field"
+INVALID_DATE = "invalid_date"
+
+# Pipeline stages; the Source column holds the file line number for
+# STAGE_READ and the TransactionID for STAGE_VALIDATE
+STAGE_READ = "read"
+STAGE_VALIDATE = "validate"
+
+TRANSACTION_FIELDS = ['TransactionID', 'Date', 'ProductID', 'ProductName',
+                      'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+
+
+class RejectionSink:
+    """
+    Collects rejected rows with a reason code.
+    Keeps per-reason counters and the most recent rows in a bounded ring buffer;
+    if a filename is given, rows are also written to it in batches so the
+    cost per rejection stays at a counter bump and a list append.
+    The file is truncated when the sink is created (so a run without
+    rejections still leaves an empty, current file) and appended to afterwards.
+    """
+
+    def __init__(self, filename=None, capacity=1000, batch_size=500):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.counts = Counter()
+        self.recent = deque(maxlen=capacity)
+        self._pending = []
+        self._file = None
+        if filename:
+            directory = os.path.dirname(filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(filename, "w", encoding="utf-8")
+            self._file.write("Stage|Source|Reason|Row\n")
+
+    def record(self, reason, row, source=None, stage=None):
+        """
+        Records one rejected row.
+        row can be the raw line or the transaction dictionary (written in
+        source-file field order); source locates the row within its stage
+        (see STAGE_READ / STAGE_VALIDATE).
+        """
+        self.counts[reason] += 1
+        entry = (stage, source, reason, row)
+        self.recent.append(entry)
+        if self.filename:
+            self._pending.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        if self._file is None:
+            # Reopened after close(): keep what was already written
+            self._file = open(self.filename, "a", encoding="utf-8")
+        self._file.writelines(
+            f"{_blank(stage)}|{_blank(source)}|{reason}|{_format_row(row)}\n"
+            for stage, source, reason, row in self._pending
+        )
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def summary(self):
+        """
+        Returns: dictionary {reason: count} sorted by count descending
+        """
+        return dict(self.counts.most_common())
+
+
+def _blank(value):
+    return "" if value is None else value
+
+
+def _format_row(row):
+    if isinstance(row, dict):
+        return "|".join(str(row.get(field, "")) for field in TRANSACTION_FIELDS)
+    return str(row).rstrip("\n")
@@ -1,136 +1,362 @@
+import csv
+import html
+import io
+import json
 import os
 from datetime import datetime
-from collections import defaultdict
 
-def generate_sales_report(transactions, enriched_transactions, output_file="output/sales_report.txt"):
+from utils.data_processor import (
+    calculate_total_revenue,
+    region_wise_sales,
+    top_selling_products,
+    customer_analysis,
+    daily_sales_trend,
+    low_performing_products
+)
+
+
+def build_report_aggregates(total_revenue, region_stats, top_products, customer_stats,
+                            daily_trends, low_products, enriched_transactions):
     """
-    Generates a detailed sales report including overall summary,
-    region-wise performance, top products, top customers, daily trends,
-    product performance, and API enrichment summary.
+    Assembles the report statistics from results already computed by
+    utils.data_processor (calculate_total_revenue, region_wise_sales,
+    top_selling_products, customer_analysis, daily_sales_trend,
+    low_performing_products). Only enriched_transactions is scanned, once.
+    Returns a dictionary of plain values that the render_* functions consume.
     """
-    if not transactions:
-        print("No transactions to generate report.")
-        return
+    total_transactions = sum(stats['transaction_count'] for stats in region_stats.values())
+    dates = list(daily_trends.keys())
+    sorted_regions = sorted(region_stats.items(), key=lambda x: x[1]['total_sales'], reverse=True)
+    top_customers = sorted(customer_stats.items(), key=lambda x: x[1]['total_spent'], reverse=True)[:5]
 
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    total_enriched = 0
+    failed_products = []
+    for t in enriched_transactions:
+        if t.get("API_Match"):
+            total_enriched += 1
+        else:
+            failed_products.append(t['ProductName'])
+    total_products = len(enriched_transactions)
+
+    return {
+        "generated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "summary": {
+            "total_revenue": total_revenue,
+            "total_transactions": total_transactions,
+            "avg_order_value": total_revenue / total_transactions if total_transactions else 0,
+            "date_range": f"{min(dates)} to {max(dates)}" if dates else "N/A"
+        },
+        "regions": [
+            {
+                "region": region,
+                "revenue": stats['total_sales'],
+                "percent": (stats['total_sales'] / total_revenue * 100) if total_revenue else 0,
+                "transactions": stats['transaction_count']
+            }
+            for region, stats in sorted_regions
+        ],
+        "top_products": [
+            {"rank": i, "product": pname, "quantity": quantity, "revenue": revenue}
+            for i, (pname, quantity, revenue) in enumerate(top_products, 1)
+        ],
+        "top_customers": [
+            {"rank": i, "customer_id": cid, "total_spent": stats['total_spent'], "orders": stats['purchase_count']}
+            for i, (cid, stats) in enumerate(top_customers, 1)
+        ],
+        "daily_trend": [
+            {
+                "date": date,
+                "revenue": stats['revenue'],
+                "transactions": stats['transaction_count'],
+                "unique_customers": stats['unique_customers']
+            }
+            for date, stats in sorted(daily_trends.items())
+        ],
+        "product_performance": {
+            "best_selling": top_products[0][0] if top_products else "N/A",
+            "low_performing": [
+                {"product": p, "quantity": q, "revenue": r}
+                for p, q, r in low_products
+            ],
+            "avg_transaction_by_region": {
+                r: stats['total_sales'] / stats['transaction_count'] if stats['transaction_count'] else 0
+                for r, stats in region_stats.items()
+            }
+        },
+        "api_enrichment": {
+            "enriched": total_enriched,
+            "total": total_products,
+            "success_rate": (total_enriched / total_products * 100) if total_products else 0,
+            "not_enriched": failed_products
+        }
+    }
+
+
+def compute_report_aggregates(transactions, enriched_transactions):
+    """
+    Runs the utils.data_processor aggregations on transactions and builds the
+    report statistics from them (see build_report_aggregates).
+    """
+    return build_report_aggregates(
+        calculate_total_revenue(transactions),
+        region_wise_sales(transactions),
+        top_selling_products(transactions, n=5),
+        customer_analysis(transactions),
+        daily_sales_trend(transactions),
+        low_performing_products(transactions),
+        enriched_transactions
+    )
+
+
+def render_text(aggregates):
+    """
+    Renders the aggregates in the plain-text sales report layout
+    """
+    summary = aggregates["summary"]
+    performance = aggregates["product_performance"]
+    enrichment = aggregates["api_enrichment"]
 
     # HEADER
     report_lines = []
     report_lines.append("SALES ANALYTICS REPORT")
-    report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report_lines.append(f"Generated: {aggregates['generated']}")
     report_lines.append("\n")
 
     # OVERALL SUMMARY
-    total_revenue = sum(t['Quantity'] * t['UnitPrice'] for t in transactions)
-    total_transactions = len(transactions)
-    avg_order_value = total_revenue / total_transactions if total_transactions else 0
-    dates = [t['Date'] for t in transactions]
-    date_range = f"{min(dates)} to {max(dates)}" if dates else "N/A"
-
     report_lines.append("OVERALL SUMMARY")
-    report_lines.append(f"Total Revenue: {total_revenue:,.2f}")
-    report_lines.append(f"Total Transactions: {total_transactions}")
-    report_lines.append(f"Average Order Value: {avg_order_value:,.2f}")
-    report_lines.append(f"Date Range: {date_range}")
+    report_lines.append(f"Total Revenue: {summary['total_revenue']:,.2f}")
+    report_lines.append(f"Total Transactions: {summary['total_transactions']}")
+    report_lines.append(f"Average Order Value: {summary['avg_order_value']:,.2f}")
+    report_lines.append(f"Date Range: {summary['date_range']}")
     report_lines.append("\n")
 
     # REGION-WISE PERFORMANCE
     report_lines.append("REGION-WISE PERFORMANCE")
-    region_stats = defaultdict(lambda: {"revenue": 0, "count": 0})
-    for t in transactions:
-        region = t['Region']
-        amt = t['Quantity'] * t['UnitPrice']
-        region_stats[region]["revenue"] += amt
-        region_stats[region]["count"] += 1
-
-    sorted_regions = sorted(region_stats.items(), key=lambda x: x[1]["revenue"], reverse=True)
     report_lines.append(f"{'Region':<10} {'Sales':>15} {'% of Total':>12} {'Transactions':>12}")
-    for region, stats in sorted_regions:
-        percent_total = (stats["revenue"] / total_revenue * 100) if total_revenue else 0
-        report_lines.append(f"{region:<10} {stats['revenue']:>15,.2f} {percent_total:>11.2f}% {stats['count']:>12}")
+    for r in aggregates["regions"]:
+        report_lines.append(f"{r['region']:<10} {r['revenue']:>15,.2f} {r['percent']:>11.2f}% {r['transactions']:>12}")
 
     report_lines.append("\n")
 
     # TOP 5 PRODUCTS
     report_lines.append("TOP 5 PRODUCTS")
-    product_stats = defaultdict(lambda: {"quantity": 0, "revenue": 0})
-    for t in transactions:
-        pname = t['ProductName']
-        product_stats[pname]["quantity"] += t['Quantity']
-        product_stats[pname]["revenue"] += t['Quantity'] * t['UnitPrice']
-
-    top_products = sorted(product_stats.items(), key=lambda x: x[1]["quantity"], reverse=True)[:5]
     report_lines.append(f"{'Rank':<5} {'Product Name':<20} {'Quantity':>10} {'Revenue':>15}")
-    for i, (pname, stats) in enumerate(top_products, 1):
-        report_lines.append(f"{i:<5} {pname:<20} {stats['quantity']:>10} {stats['revenue']:>15,.2f}")
+    for p in aggregates["top_products"]:
+        report_lines.append(f"{p['rank']:<5} {p['product']:<20} {p['quantity']:>10} {p['revenue']:>15,.2f}")
 
     report_lines.append("\n")
 
     # TOP 5 CUSTOMERS
     report_lines.append("TOP 5 CUSTOMERS")
-    customer_stats = defaultdict(lambda: {"spent": 0, "orders": 0})
-    for t in transactions:
-        cid = t['CustomerID']
-        amt = t['Quantity'] * t['UnitPrice']
-        customer_stats[cid]["spent"] += amt
-        customer_stats[cid]["orders"] += 1
-
-    top_customers = sorted(customer_stats.items(), key=lambda x: x[1]["spent"], reverse=True)[:5]
     report_lines.append(f"{'Rank':<5} {'Customer ID':<15} {'Total Spent':>15} {'Orders':>8}")
-    for i, (cid, stats) in enumerate(top_customers, 1):
-        report_lines.append(f"{i:<5} {cid:<15} {stats['spent']:>15,.2f} {stats['orders']:>8}")
+    for c in aggregates["top_customers"]:
+        report_lines.append(f"{c['rank']:<5} {c['customer_id']:<15} {c['total_spent']:>15,.2f} {c['orders']:>8}")
 
     report_lines.append("\n")
 
     # DAILY SALES TREND
     report_lines.append("DAILY SALES TREND")
-    daily_stats = defaultdict(lambda: {"revenue": 0, "transactions": 0, "unique_customers": set()})
-    for t in transactions:
-        date = t['Date']
-        amt = t['Quantity'] * t['UnitPrice']
-        daily_stats[date]["revenue"] += amt
-        daily_stats[date]["transactions"] += 1
-        daily_stats[date]["unique_customers"].add(t['CustomerID'])
-
     report_lines.append(f"{'Date':<12} {'Revenue':>12} {'Transactions':>12} {'Unique Customers':>18}")
-    for date in sorted(daily_stats.keys()):
-        stats = daily_stats[date]
-        report_lines.append(f"{date:<12} {stats['revenue']:>12,.2f} {stats['transactions']:>12} {len(stats['unique_customers']):>18}")
+    for d in aggregates["daily_trend"]:
+        report_lines.append(f"{d['date']:<12} {d['revenue']:>12,.2f} {d['transactions']:>12} {d['unique_customers']:>18}")
 
     report_lines.append("\n")
 
     # PRODUCT PERFORMANCE ANALYSIS
     report_lines.append("PRODUCT PERFORMANCE ANALYSIS")
-    best_selling = top_products[0][0] if top_products else "N/A"
-    low_perf = [(p, s["quantity"], s["revenue"]) for p, s in product_stats.items() if s["quantity"] < 10]
-    avg_transaction_region = {r: stats["revenue"] / stats["count"] if stats["count"] else 0 for r, stats in region_stats.items()}
-
-    report_lines.append(f"Best Selling Product: {best_selling}")
-    if low_perf:
+    report_lines.append(f"Best Selling Product: {performance['best_selling']}")
+    if performance["low_performing"]:
         report_lines.append("Low Performing Products:")
-        for p, q, r in low_perf:
-            report_lines.append(f"{p}: Quantity={q}, Revenue={r:,.2f}")
+        for p in performance["low_performing"]:
+            report_lines.append(f"{p['product']}: Quantity={p['quantity']}, Revenue={p['revenue']:,.2f}")
     report_lines.append("Average Transaction Value per Region:")
-    for r, avg in avg_transaction_region.items():
+    for r, avg in performance["avg_transaction_by_region"].items():
         report_lines.append(f"{r}: {avg:,.2f}")
 
     report_lines.append("\n")
 
     # API ENRICHMENT SUMMARY
     report_lines.append("API ENRICHMENT SUMMARY")
-    total_enriched = sum(1 for t in enriched_transactions if t.get("API_Match"))
-    total_products = len(enriched_transactions)
-    failed_products = [t['ProductName'] for t in enriched_transactions if not t.get("API_Match")]
-    success_rate = (total_enriched / total_products * 100) if total_products else 0
-
-    report_lines.append(f"Total Products Enriched: {total_enriched}/{total_products}")
-    report_lines.append(f"Success Rate: {success_rate:.2f}%")
-    if failed_products:
+    report_lines.append(f"Total Products Enriched: {enrichment['enriched']}/{enrichment['total']}")
+    report_lines.append(f"Success Rate: {enrichment['success_rate']:.2f}%")
+    if enrichment["not_enriched"]:
         report_lines.append("Products Not Enriched:")
-        report_lines.append(", ".join(failed_products))
+        report_lines.append(", ".join(enrichment["not_enriched"]))
+
+    return "\n".join(report_lines)
+
+
+def render_json(aggregates):
+    """
+    Renders the aggregates as a JSON document
+    """
+    return json.dumps(aggregates, indent=2)
+
+
+def render_csv(aggregates):
+    """
+    Renders the aggregates as long-format CSV: section, key, metric, value
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["section", "key", "metric", "value"])
+
+    writer.writerow(["meta", "", "generated", aggregates["generated"]])
+    for metric, value in aggregates["summary"].items():
+        writer.writerow(["summary", "", metric, value])
+    for r in aggregates["regions"]:
+        for metric in ("revenue", "percent", "transactions"):
+            writer.writerow(["region", r["region"], metric, r[metric]])
+    for p in aggregates["top_products"]:
+        for metric in ("rank", "quantity", "revenue"):
+            writer.writerow(["top_product", p["product"], metric, p[metric]])
+    for c in aggregates["top_customers"]:
+        for metric in ("rank", "total_spent", "orders"):
+            writer.writerow(["top_customer", c["customer_id"], metric, c[metric]])
+    for d in aggregates["daily_trend"]:
+        for metric in ("revenue", "transactions", "unique_customers"):
+            writer.writerow(["daily_trend", d["date"], metric, d[metric]])
+
+    performance = aggregates["product_performance"]
+    writer.writerow(["product_performance", "", "best_selling", performance["best_selling"]])
+    for p in performance["low_performing"]:
+        for metric in ("quantity", "revenue"):
+            writer.writerow(["low_performing", p["product"], metric, p[metric]])
+    for r, avg in performance["avg_transaction_by_region"].items():
+        writer.writerow(["avg_transaction_by_region", r, "avg_transaction_value", avg])
+
+    enrichment = aggregates["api_enrichment"]
+    for metric in ("enriched", "total", "success_rate"):
+        writer.writerow(["api_enrichment", "", metric, enrichment[metric]])
+    for name in enrichment["not_enriched"]:
+        writer.writerow(["api_enrichment", name, "not_enriched", ""])
+
+    return buffer.getvalue()
+
+
+def _html_table(headers, rows):
+    lines = ["<table>", "<tr>" + "".join(f"<th>{html.escape(h)}</th>" for h in headers) + "</tr>"]
+    for row in rows:
+        lines.append("<tr>" + "".join(f"<td>{html.escape(str(v))}</td>" for v in row) + "</tr>")
+    lines.append("</table>")
+    return "\n".join(lines)
+
+
+def render_html(aggregates):
+    """
+    Renders the aggregates as a standalone HTML page
+    """
+    summary = aggregates["summary"]
+    performance = aggregates["product_performance"]
+    enrichment = aggregates["api_enrichment"]
+
+    parts = [
+        "<!DOCTYPE html>",
+        "<html>",
+        "<head><meta charset=\"utf-8\"><title>Sales Analytics Report</title></head>",
+        "<body>",
+        "<h1>Sales Analytics Report</h1>",
+        f"<p>Generated: {html.escape(aggregates['generated'])}</p>",
+        "<h2>Overall Summary</h2>",
+        _html_table(["Metric", "Value"], [
+            ["Total Revenue", f"{summary['total_revenue']:,.2f}"],
+            ["Total Transactions", summary["total_transactions"]],
+            ["Average Order Value", f"{summary['avg_order_value']:,.2f}"],
+            ["Date Range", summary["date_range"]]
+        ]),
+        "<h2>Region-wise Performance</h2>",
+        _html_table(["Region", "Sales", "% of Total", "Transactions"], [
+            [r["region"], f"{r['revenue']:,.2f}", f"{r['percent']:.2f}%", r["transactions"]]
+            for r in aggregates["regions"]
+        ]),
+        "<h2>Top 5 Products</h2>",
+        _html_table(["Rank", "Product Name", "Quantity", "Revenue"], [
+            [p["rank"], p["product"], p["quantity"], f"{p['revenue']:,.2f}"]
+            for p in aggregates["top_products"]
+        ]),
+        "<h2>Top 5 Customers</h2>",
+        _html_table(["Rank", "Customer ID", "Total Spent", "Orders"], [
+            [c["rank"], c["customer_id"], f"{c['total_spent']:,.2f}", c["orders"]]
+            for c in aggregates["top_customers"]
+        ]),
+        "<h2>Daily Sales Trend</h2>",
+        _html_table(["Date", "Revenue", "Transactions", "Unique Customers"], [
+            [d["date"], f"{d['revenue']:,.2f}", d["transactions"], d["unique_customers"]]
+            for d in aggregates["daily_trend"]
+        ]),
+        "<h2>Product Performance Analysis</h2>",
+        f"<p>Best Selling Product: {html.escape(str(performance['best_selling']))}</p>",
+        _html_table(["Low Performing Product", "Quantity", "Revenue"], [
+            [p["product"], p["quantity"], f"{p['revenue']:,.2f}"]
+            for p in performance["low_performing"]
+        ]),
+        _html_table(["Region", "Average Transaction Value"], [
+            [r, f"{avg:,.2f}"] for r, avg in performance["avg_transaction_by_region"].items()
+        ]),
+        "<h2>API Enrichment Summary</h2>",
+        f"<p>Total Products Enriched: {enrichment['enriched']}/{enrichment['total']}</p>",
+        f"<p>Success Rate: {enrichment['success_rate']:.2f}%</p>"
+    ]
+    if enrichment["not_enriched"]:
+        parts.append(f"<p>Products Not Enriched: {html.escape(', '.join(enrichment['not_enriched']))}</p>")
+    parts.extend(["</body>", "</html>"])
+    return "\n".join(parts)
+
+
+RENDERERS = {
+    "txt": render_text,
+    "json": render_json,
+    "csv": render_csv,
+    "html": render_html
+}
+
 
-    # Write to file
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(report_lines))
+def write_reports(aggregates, output_file="output/sales_report.txt", formats=("txt",)):
+    """
+    Writes one file per requested format from the same aggregates.
+    The txt report is written to output_file exactly as given; every other
+    format goes next to it with that format's extension. Raises ValueError
+    if two formats would be written to the same path.
+    Returns: list of written file paths
+    """
+    unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+    if unknown:
+        raise ValueError(f"Unsupported report format(s): {', '.join(unknown)}")
+
+    base = os.path.splitext(output_file)[0]
+    paths = {fmt: output_file if fmt == "txt" else f"{base}.{fmt}" for fmt in formats}
+    if len(set(paths.values())) != len(paths):
+        raise ValueError(f"Report formats {', '.join(formats)} would overwrite each other at {output_file}")
+
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    written = []
+    for fmt, path in paths.items():
+        # csv.writer emits its own line endings
+        newline = "" if fmt == "csv" else None
+        with open(path, "w", encoding="utf-8", newline=newline) as f:
+            f.write(RENDERERS[fmt](aggregates))
+        written.append(path)
+    return written
+
+
+def generate_sales_report(transactions, enriched_transactions, output_file="output/sales_report.txt",
+                          formats=("txt",)):
+    """
+    Generates a detailed sales report including overall summary,
+    region-wise performance, top products, top customers, daily trends,
+    product performance, and API enrichment summary.
+    The statistics are computed once with utils.data_processor and rendered
+    in every requested format (txt, json, csv, html); callers that already
+    hold those results should use build_report_aggregates and write_reports.
+    """
+    if not transactions:
+        print("No transactions to generate report.")
+        return
 
-    print(f"Sales report generated and saved to {output_file}")
+    aggregates = compute_report_aggregates(transactions, enriched_transactions)
+    for path in write_reports(aggregates, output_file, formats):
+        print(f"Sales report generated and saved to {path}")
+    return aggregates
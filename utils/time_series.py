@@ -0,0 +1,183 @@
+import heapq
+from datetime import date, timedelta
+
+
+class RollingSalesTracker:
+    """
+    Maintains rolling N-day revenue, moving averages, week-over-week
+    deltas and the top-K peak days as daily totals arrive.
+    Each new day is an O(1) update per window (plus O(log K) for the peaks),
+    so it can be fed a multi-year history or a live stream of days.
+    """
+
+    def __init__(self, windows=(7, 30, 90), top_k=5):
+        if not windows or any(w <= 0 for w in windows):
+            raise ValueError("windows must be positive integers")
+        self.windows = tuple(sorted(set(windows)))
+        self.top_k = top_k
+
+        # 7 and 14 are always tracked so week-over-week can be derived
+        self._tracked = tuple(sorted(set(self.windows) | {7, 14}))
+        self._span = self._tracked[-1]
+        self._ring = [0.0] * self._span
+        self._pos = 0
+        self._sums = {w: 0.0 for w in self._tracked}
+        self._days_seen = 0
+        self._last_date = None
+        self._last_revenue = 0.0
+        self._peaks = []
+
+    def add_day(self, day, revenue, transaction_count=0):
+        """
+        Adds one day's totals. Days must arrive in increasing order;
+        missing calendar days in between are counted as zero revenue.
+        Returns: dictionary of the metrics as of this day (see current())
+        """
+        current_day = _to_date(day)
+        if self._last_date is not None:
+            if current_day <= self._last_date:
+                raise ValueError(f"Day {current_day} is not after {self._last_date}")
+            gap = (current_day - self._last_date).days - 1
+            for _ in range(min(gap, self._span)):
+                self._push(0.0)
+            # Beyond one full span every window is already zero
+            self._days_seen += max(gap - self._span, 0)
+
+        self._push(revenue)
+        self._last_date = current_day
+        self._last_revenue = revenue
+
+        # Ties keep the earlier day, matching find_peak_sales_day
+        entry = (revenue, -current_day.toordinal(), current_day.isoformat(), transaction_count)
+        if len(self._peaks) < self.top_k:
+            heapq.heappush(self._peaks, entry)
+        elif self._peaks and entry > self._peaks[0]:
+            heapq.heapreplace(self._peaks, entry)
+
+        return self.current()
+
+    def _push(self, revenue):
+        for w in self._tracked:
+            if self._days_seen >= w:
+                self._sums[w] -= self._ring[(self._pos - w) % self._span]
+            self._sums[w] += revenue
+        self._ring[self._pos] = revenue
+        self._pos = (self._pos + 1) % self._span
+        self._days_seen += 1
+
+    def current(self):
+        """
+        Returns the metrics as of the latest day:
+        {'date', 'revenue', 'rolling_revenue': {window: float},
+         'moving_average': {window: float or None}, 'week_over_week': {...}}
+        While fewer than `window` days have been seen, rolling_revenue sums the
+        days available so far and moving_average is None. Likewise, until 14 days
+        have been seen week_over_week only reports current_week; previous_week,
+        delta and pct_change are None.
+        """
+        if self._last_date is None:
+            return None
+
+        rolling = {w: round(self._sums[w], 2) for w in self.windows}
+        averages = {
+            w: round(self._sums[w] / w, 2) if self._days_seen >= w else None
+            for w in self.windows
+        }
+
+        this_week = self._sums[7]
+        if self._days_seen >= 14:
+            previous = self._sums[14] - self._sums[7]
+            last_week = round(previous, 2)
+            delta = round(this_week - previous, 2)
+            pct_change = round((this_week - previous) / previous * 100, 2) if previous else None
+        else:
+            last_week = delta = pct_change = None
+
+        return {
+            'date': self._last_date.isoformat(),
+            'revenue': self._last_revenue,
+            'rolling_revenue': rolling,
+            'moving_average': averages,
+            'week_over_week': {
+                'current_week': round(this_week, 2),
+                'previous_week': last_week,
+                'delta': delta,
+                'pct_change': pct_change
+            }
+        }
+
+    def top_peaks(self):
+        """
+        Returns: list of tuples (date, revenue, transaction_count), highest revenue first
+        """
+        ranked = sorted(self._peaks, reverse=True)
+        return [(d, round(revenue, 2), count) for revenue, _, d, count in ranked]
+
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value.strip())
+
+
+def rolling_sales_metrics(daily_trends, windows=(7, 30, 90)):
+    """
+    Computes rolling metrics for every calendar day covered by the output of
+    daily_sales_trend (days without sales count as zero revenue).
+    Returns: dictionary sorted by date {date: metrics} (see RollingSalesTracker.current())
+    """
+    tracker = RollingSalesTracker(windows=windows)
+    metrics = {}
+
+    if not daily_trends:
+        return metrics
+
+    days = sorted((_to_date(d), stats) for d, stats in daily_trends.items())
+    current_day = days[0][0]
+    for day, stats in days:
+        while current_day < day:
+            metrics[current_day.isoformat()] = tracker.add_day(current_day, 0.0)
+            current_day += timedelta(days=1)
+        metrics[day.isoformat()] = tracker.add_day(day, stats['revenue'], stats['transaction_count'])
+        current_day = day + timedelta(days=1)
+
+    return metrics
+
+
+def rolling_revenue(daily_trends, window=7):
+    """
+    Returns: dictionary {date: total revenue of the last `window` days}
+    """
+    metrics = rolling_sales_metrics(daily_trends, windows=(window,))
+    return {d: m['rolling_revenue'][window] for d, m in metrics.items()}
+
+
+def moving_average(daily_trends, window=7):
+    """
+    Returns: dictionary {date: average daily revenue over the last `window` days},
+    None for dates before a full window is available
+    """
+    metrics = rolling_sales_metrics(daily_trends, windows=(window,))
+    return {d: m['moving_average'][window] for d, m in metrics.items()}
+
+
+def week_over_week(daily_trends):
+    """
+    Compares each trailing 7-day revenue with the 7 days before it
+    Returns: dictionary {date: {current_week, previous_week, delta, pct_change}}
+    """
+    metrics = rolling_sales_metrics(daily_trends, windows=(7,))
+    return {d: m['week_over_week'] for d, m in metrics.items()}
+
+
+def top_peak_days(daily_trends, k=5):
+    """
+    Finds the k dates with highest revenue without sorting every day
+    Returns: list of tuples (date, revenue, transaction_count)
+    """
+    ranked = heapq.nlargest(
+        k,
+        daily_trends.items(),
+        key=lambda x: (x[1]['revenue'], -_to_date(x[0]).toordinal())
+    )
+    return [(d, round(stats['revenue'], 2), stats['transaction_count']) for d, stats in ranked]